@@ -3,7 +3,6 @@ Example usage of the Pgcon (PostgreSQL Connector) module.
 """
 
 from pgcon import Pgcon
-import pandas as pd
 
 def main():
     print("Pgcon Example - PostgreSQL Database Operations")
@@ -32,10 +31,9 @@ def main():
     except FileNotFoundError:
         print("   sample.csv not found in current directory")
     
-    print("\n3. Converting to DataFrame:")
+    print("\n3. Working with the DataFrame:")
     try:
-        data = pgcon.load_csv_data("sample.csv")
-        df = pd.DataFrame(data)
+        df = pgcon.load_csv_frame("sample.csv")
         print(f"   DataFrame shape: {df.shape}")
         print(f"   Column names: {list(df.columns)}")
         print(f"   Anomaly distribution:\n{df['ensemble_anomaly'].value_counts()}")
@@ -1,12 +1,16 @@
 import pandas as pd
-import re
-import math
+import numpy as np
 import os
-from collections import Counter
-from typing import List
 import logging
+import re
 from datetime import datetime
 
+_TOKEN_RE = re.compile(r'\w+')
+_FAILED_AUTH_RE = re.compile(r'failed password', re.IGNORECASE)
+_INVALID_USER_RE = re.compile(r'invalid user', re.IGNORECASE)
+# Columns used when a frame lacks host/process, as LogParser.normalize output does
+_COLUMN_FALLBACKS = {'host': 'source_file', 'process': 'service'}
+
 
 class FeatureEngineering:
     """
@@ -60,26 +64,39 @@ class FeatureEngineering:
                 pass  # Silently fail if logging fails
         print(f"WARNING: {message}")  # Also print to console
 
-    def _calculate_entropy(self, messages: List[str]) -> float:
-        """Calculate entropy of tokens in messages."""
-        all_tokens = []
-        for msg in messages:
-            all_tokens.extend(re.findall(r'\w+', msg.lower()))
-        if not all_tokens:
-            return 0.0
-        counts = Counter(all_tokens)
-        total = sum(counts.values())
-        probs = [c/total for c in counts.values()]
-        entropy = -sum(p * math.log2(p) for p in probs if p > 0)
-        return entropy
+    def _calculate_entropy(self, messages: pd.Series, window_ids: np.ndarray) -> pd.Series:
+        """Calculate per-window entropy of tokens in messages."""
+        # Flatten to one row per token so counting runs as a single groupby
+        tokens = pd.DataFrame({
+            'window_id': window_ids,
+            'token': messages.str.lower().str.findall(_TOKEN_RE).to_numpy(),
+        }).explode('token').dropna()
+        counts = tokens.groupby(['window_id', 'token']).size()
+        windows = np.unique(window_ids)
+        pos = np.searchsorted(windows, counts.index.get_level_values('window_id'))
+        c = counts.to_numpy(dtype=np.float64)
+        p = c / np.bincount(pos, weights=c, minlength=len(windows))[pos]
+        entropy = -np.bincount(pos, weights=p * np.log2(p), minlength=len(windows))
+        # Without any tokens bincount returns int64; entropy is always float
+        return pd.Series(entropy, index=windows, dtype='float64')
 
     # ---------- Return Pandas features ----------
     def get_features(self) -> pd.DataFrame:
         """Generate features from parsed logs using time windows."""
         self._log_info(f"Generating features from DataFrame with {len(self.df)} rows")
         
-        # Remove rows with missing timestamps
-        df = self.df.dropna(subset=['timestamp']).sort_values('timestamp')
+        # Keep only the consumed columns, then remove rows with missing timestamps
+        columns = ['timestamp', 'message', 'host', 'process']
+        sources = [_COLUMN_FALLBACKS[col] if col not in self.df.columns and _COLUMN_FALLBACKS.get(col) in self.df.columns
+                   else col for col in columns]
+        df = self.df[sources]
+        df.columns = columns
+        df = df.dropna(subset=['timestamp'])
+        # Time-order the rows with a stable argsort over the raw int64 nanoseconds
+        ts_ns = df['timestamp'].to_numpy(dtype='datetime64[ns]').view('i8')
+        perm = np.argsort(ts_ns, kind='stable')
+        df = df.take(perm)
+        ts_ns = ts_ns[perm]
         self._log_info(f"Rows with valid timestamps: {len(df)}/{len(self.df)} ({100*len(df)/len(self.df):.1f}%)")
         
         if df.empty:
@@ -95,48 +112,46 @@ class FeatureEngineering:
         end = df['timestamp'].max()
         delta = pd.Timedelta(seconds=self.window)
         self._log_info(f"Time range: {start} to {end}, Window size: {self.window} seconds")
-        
-        # Create time windows
-        windows = []
-        current = start
-        while current <= end:
-            windows.append((current, current + delta))
-            current += delta
 
-        self._log_info(f"Created {len(windows)} time windows")
-        
-        feature_rows = []
-        empty_windows = 0
-        processed_windows = 0
-        
-        for i, (w_start, w_end) in enumerate(windows):
-            win_df = df[(df['timestamp'] >= w_start) & (df['timestamp'] < w_end)]
-            if win_df.empty:
-                empty_windows += 1
-                continue
-            
-            processed_windows += 1
-            # Calculate features for this window
-            features = {
-                'window_start': w_start,
-                'window_end': w_end,
-                'event_count': len(win_df),
-                'unique_messages': win_df['message'].nunique(),
-                'distinct_hosts': win_df['host'].nunique(),
-                'distinct_processes': win_df['process'].nunique(),
-                'avg_msg_length': win_df['message'].str.len().mean() if not win_df['message'].empty else 0,
-                'failed_auth_count': win_df['message'].str.contains(r'failed password', case=False, na=False).sum(),
-                'invalid_user_count': win_df['message'].str.contains(r'invalid user', case=False, na=False).sum(),
-                'entropy_tokens': self._calculate_entropy(win_df['message'].tolist())
-            }
-            feature_rows.append(features)
-            
-            # Log progress for every 10th window
-            if (i + 1) % 10 == 0:
-                self._log_info(f"Processed {i + 1} windows, {processed_windows} contained data")
-        
-        result_df = pd.DataFrame(feature_rows)
-        self._log_info(f"Feature generation complete. Processed {len(windows)} windows: {processed_windows} with data, {empty_windows} empty")
+        # Assign each event to its window using the raw int64 nanosecond view
+        window_ids = (ts_ns - ts_ns.min()) // delta.value
+        n_windows = int(window_ids.max()) + 1
+        self._log_info(f"Created {n_windows} time windows")
+
+        messages = df['message']
+        # Factorize the string columns once so per-window distinct counts hash
+        # integer codes rather than strings; missing values stay NaN
+        codes = {col: pd.factorize(df[col])[0] for col in ('message', 'host', 'process')}
+        df = df.assign(
+            window_id=window_ids,
+            message_code=np.where(codes['message'] >= 0, codes['message'], np.nan),
+            host_code=np.where(codes['host'] >= 0, codes['host'], np.nan),
+            process_code=np.where(codes['process'] >= 0, codes['process'], np.nan),
+            msg_length=messages.str.len(),
+            failed_auth=messages.str.contains(_FAILED_AUTH_RE, na=False),
+            invalid_user=messages.str.contains(_INVALID_USER_RE, na=False),
+        )
+
+        # Aggregate all non-empty windows in a single groupby pass
+        grouped = df.groupby('window_id', sort=True)
+        result_df = grouped.agg(
+            event_count=('message', 'size'),
+            unique_messages=('message_code', 'nunique'),
+            distinct_hosts=('host_code', 'nunique'),
+            distinct_processes=('process_code', 'nunique'),
+            avg_msg_length=('msg_length', 'mean'),
+            failed_auth_count=('failed_auth', 'sum'),
+            invalid_user_count=('invalid_user', 'sum'),
+        )
+        result_df['entropy_tokens'] = self._calculate_entropy(messages, window_ids)
+        window_starts = start + pd.to_timedelta(result_df.index.to_numpy() * delta.value, unit='ns')
+        result_df.insert(0, 'window_start', window_starts)
+        result_df.insert(1, 'window_end', window_starts + delta)
+        result_df = result_df.reset_index(drop=True)
+
+        processed_windows = len(result_df)
+        empty_windows = n_windows - processed_windows
+        self._log_info(f"Feature generation complete. Processed {n_windows} windows: {processed_windows} with data, {empty_windows} empty")
         self._log_info(f"Generated {len(result_df)} feature rows with {len(result_df.columns)} columns")
         
         # Log some statistics about the features
@@ -1,14 +1,125 @@
 import pandas as pd
+import numpy as np
 import re
-from dateutil import parser as date_parser
 import socket
 import os
 from typing import List, Dict, Optional
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 import json
-import ipaddress
+import codecs
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import importlib.util
+
+# Parquet output needs pyarrow, which is optional
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# pyahocorasick speeds up indicator keyword matching when it is installed
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+# Log line formats, tried in order, each paired with the format of its timestamp
+# group; anything else falls back to keyword search
+_LOG_PATTERNS = [
+    # Apache/Nginx combined log format (the zone offset is dropped before parsing)
+    (re.compile(r'^(?P<ip>\d{1,3}(?:\.\d{1,3}){3}) - - \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^"]*)" (?P<status>\d+) (?P<size>\d+) "(?P<referer>[^"]*)" "(?P<user_agent>[^"]*)"'),
+     '%d/%b/%Y:%H:%M:%S'),
+
+    # Syslog format; it carries no year, so the current one is prepended
+    (re.compile(r'^(?P<timestamp>\w+\s+\d+\s+\d+:\d+:\d+)\s+(?P<host>\S+)\s+(?P<process>\S+)(?:\[(?P<pid>\d+)\])?:\s+(?P<message>.*)'),
+     '%Y %b %d %H:%M:%S'),
+
+    # Windows Event Log format
+    (re.compile(r'^TimeGenerated:\s*(?P<timestamp>\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}),\s*EventID:\s*(?P<event_id>\d+),\s*Level:\s*(?P<level>\w+),\s*Source:\s*(?P<source>[^,]+),\s*Message:\s*(?P<message>.*)'),
+     '%Y-%m-%d %H:%M:%S'),
+
+    # Generic format with timestamp and level
+    (re.compile(r'^(?P<timestamp>\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\s*(?:\[(?P<level>\w+)\])?\s*(?P<message>.*)'),
+     'ISO8601'),
+]
+_APACHE_TIMESTAMP_FORMAT = _LOG_PATTERNS[0][1]
+_SYSLOG_TIMESTAMP_FORMAT = _LOG_PATTERNS[1][1]
+# Fallback timestamp search for unstructured lines (ISO 8601 style)
+_TIMESTAMP_RE = re.compile(r'(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)')
+# Explicit zone offset at the end of a timestamp, e.g. +05:00 or -0700
+_TZ_OFFSET_RE = re.compile(r'([+-])(\d{2}):?(\d{2})$')
+# Apache's space-separated zone offset, e.g. " -0700", dropped before parsing
+_APACHE_OFFSET_RE = re.compile(r'\s+[+-]\d{4}$')
+# Any explicit zone designator at the end of an ISO timestamp, including Z
+_TZ_SUFFIX_RE = re.compile(r'(?:Z|[+-]\d{2}:?\d{2})$')
+_LEVEL_RE = re.compile(r'\b(ERROR|WARN|WARNING|INFO|DEBUG|CRITICAL|FATAL)\b', re.IGNORECASE)
+# Substrings every _LEVEL_RE match contains (WARNING contains WARN), for a cheap pre-filter
+_LEVEL_KEYWORDS = ('ERROR', 'WARN', 'INFO', 'DEBUG', 'CRITICAL', 'FATAL')
+_IP_RE = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
+# Dotted quad with every octet in 0-255 and no leading zeros
+_OCTET = r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+_VALID_IPV4_RE = re.compile(rf'{_OCTET}(?:\.{_OCTET}){{3}}')
+_PORT_RE = re.compile(r'(?:port|Port)[\s:]+(\d+)|[:/](\d+)')
+
+# Raw level (lowercased) -> canonical level; unknown levels are upper-cased
+_LEVEL_MAPPING = {
+    'emerg': 'CRITICAL', 'emergency': 'CRITICAL', 'fatal': 'CRITICAL',
+    'alert': 'CRITICAL', 'crit': 'CRITICAL', 'critical': 'CRITICAL',
+    'err': 'ERROR', 'error': 'ERROR',
+    'warn': 'WARNING', 'warning': 'WARNING',
+    'notice': 'INFO', 'info': 'INFO', 'information': 'INFO',
+    'debug': 'DEBUG', 'trace': 'DEBUG'
+}
+
+# Log files are read as UTF-8 unless they open with a UTF-16 byte order mark
+_UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+_DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Indicator tag -> keywords, matched as whole words in the lowercased message
+_INDICATOR_KEYWORDS = {
+    'error': ('error', 'failed', 'failure', 'invalid', 'exception'),
+    'warning': ('warning', 'warn', 'attention'),
+    'success': ('success', 'successful', 'completed', 'ok'),
+    'security': ('security', 'auth', 'authentication', 'permission', 'login', 'logout'),
+    'network': ('connect', 'disconnect', 'receive', 'send', 'packet'),
+}
+_KEYWORD_TAGS = {keyword: tag for tag, keywords in _INDICATOR_KEYWORDS.items() for keyword in keywords}
+_INDICATOR_RE = re.compile(r'\b(?:' + '|'.join(_KEYWORD_TAGS) + r')\b')
+
+
+def _build_indicator_automaton():
+    """Build an Aho-Corasick automaton mapping each keyword to (length, tag)."""
+    automaton = ahocorasick.Automaton()
+    for keyword, tag in _KEYWORD_TAGS.items():
+        automaton.add_word(keyword, (len(keyword), tag))
+    automaton.make_automaton()
+    return automaton
+
+
+_INDICATOR_AUTOMATON = _build_indicator_automaton() if AHOCORASICK_AVAILABLE else None
+
+
+def _automaton_tags(message: str) -> set:
+    """Tags whose keywords occur as whole words in a lowercased message."""
+    found = set()
+    last = len(message) - 1
+    for end, (length, tag) in _INDICATOR_AUTOMATON.iter(message):
+        # The automaton matches substrings; keep only hits bounded like \b
+        start = end - length + 1
+        before = message[start - 1] if start else ' '
+        after = message[end + 1] if end < last else ' '
+        if not (before.isalnum() or before == '_' or after.isalnum() or after == '_'):
+            found.add(tag)
+    return found
+
+
+def _normalize_chunk(lines: List[str]) -> pd.DataFrame:
+    """Normalize one chunk of raw lines; runs in a worker process."""
+    parser = LogParser(enable_logging=False)
+    parser.raw_logs = lines
+    return parser.normalize()
+
 
 class LogParser:
     """
@@ -77,12 +188,31 @@ class LogParser:
         print(f"ERROR: {message}")  # Also print to console
 
     # ---------- Read raw logs ----------
+    def _read_lines(self, file_path: str) -> List[str]:
+        """Read the stripped, non-empty lines of a log file."""
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        # The BOM alone picks the codec; utf-8-sig drops a UTF-8 BOM and is
+        # plain UTF-8 otherwise, so no content sniffing is needed
+        encoding = 'utf-16' if data[:2] in _UTF16_BOMS else 'utf-8-sig'
+        text = data.decode(encoding, errors='ignore')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        # Split and strip in C rather than iterating line by line
+        return list(filter(None, map(str.strip, text.split('\n'))))
+
+    def _try_read_lines(self, file_path: str):
+        """Read a log file, returning (lines, None) or (None, error) instead of raising."""
+        try:
+            return self._read_lines(file_path), None
+        except Exception as e:
+            return None, e
+
     def from_file(self, file_path: str):
         """Load logs from a single file."""
         self._log_info(f"Reading logs from file: {file_path}")
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                self.raw_logs = [line.strip() for line in f if line.strip()]
+            self.raw_logs = self._read_lines(file_path)
             self._log_info(f"Successfully read {len(self.raw_logs)} lines from {file_path}")
             return self
         except FileNotFoundError:
@@ -97,22 +227,22 @@ class LogParser:
         self._log_info(f"Reading logs from folder: {folder_path}")
         logs = []
         try:
-            file_count = 0
+            fnames = [fname for fname in os.listdir(folder_path)
+                      if os.path.isfile(os.path.join(folder_path, fname))]
+            file_count = len(fnames)
             total_lines = 0
-            for fname in os.listdir(folder_path):
-                path = os.path.join(folder_path, fname)
-                if os.path.isfile(path):
-                    file_count += 1
-                    try:
-                        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                            file_lines = [line.strip() for line in f if line.strip()]
-                            logs.extend(file_lines)
-                            total_lines += len(file_lines)
-                            if len(file_lines) > 0:
-                                self._log_info(f"  - Read {len(file_lines)} lines from {fname}")
-                    except Exception as e:
-                        self._log_warning(f"Error reading file {fname}: {str(e)}")
+
+            # Files are independent, so overlap their reads; results keep listing order
+            with ThreadPoolExecutor(max_workers=max(1, min(8, file_count))) as executor:
+                results = executor.map(self._try_read_lines, [os.path.join(folder_path, fname) for fname in fnames])
+                for fname, (file_lines, error) in zip(fnames, results):
+                    if error is not None:
+                        self._log_warning(f"Error reading file {fname}: {str(error)}")
                         continue
+                    logs.extend(file_lines)
+                    total_lines += len(file_lines)
+                    if len(file_lines) > 0:
+                        self._log_info(f"  - Read {len(file_lines)} lines from {fname}")
             
             self.raw_logs = logs
             self._log_info(f"Successfully read {total_lines} lines from {file_count} files in {folder_path}")
@@ -155,253 +285,226 @@ class LogParser:
         return self
 
     # ---------- Enhanced log parsing ----------
-    def normalize(self) -> pd.DataFrame:
+    def normalize(self, workers: int = 1, chunk_size: int = 100_000) -> pd.DataFrame:
         """
         Enhanced normalization that produces columns compatible with the feature engineering pipeline.
-        Returns a Pandas DataFrame with normalized columns:
+        Returns a Pandas DataFrame with normalized columns (timestamp is a UTC datetime):
         timestamp, source_file, level, indicator_tags_list, ip_src, ip_dst, 
         service, message, peer_port, line_number, ip_src_valid, ip_dst_valid, 
         message_raw, day_of_week, hour_of_day, is_weekend
+
+        With workers > 1, inputs longer than chunk_size lines are split into
+        chunks that are normalized in parallel worker processes.
         """
+        if workers > 1 and len(self.raw_logs) > chunk_size:
+            return self._normalize_parallel(workers, chunk_size)
+
         self._log_info(f"Normalizing {len(self.raw_logs)} raw log entries with enhanced parser")
         
-        parsed = []
-        successfully_parsed = 0
-        failed_parsing = 0
-        
-        # Enhanced regex patterns for different log formats
-        patterns = [
-            # Apache/Nginx combined log format
-            r'(?P<ip>\d{1,3}(?:\.\d{1,3}){3}) - - \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^"]*)" (?P<status>\d+) (?P<size>\d+) "(?P<referer>[^"]*)" "(?P<user_agent>[^"]*)"',
-            
-            # Syslog format
-            r'(?P<timestamp>\w+\s+\d+\s+\d+:\d+:\d+)\s+(?P<host>\S+)\s+(?P<process>\S+)(?:\[(?P<pid>\d+)\])?:\s+(?P<message>.*)',
-            
-            # Windows Event Log format
-            r'TimeGenerated:\s*(?P<timestamp>\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}),\s*EventID:\s*(?P<event_id>\d+),\s*Level:\s*(?P<level>\w+),\s*Source:\s*(?P<source>[^,]+),\s*Message:\s*(?P<message>.*)',
-            
-            # Generic format with timestamp and level
-            r'(?P<timestamp>\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\s*(?:\[(?P<level>\w+)\])?\s*(?P<message>.*)',
-            
-            # Fallback pattern for any line
-            r'(?P<message>.*)'
-        ]
-        
-        # Level mapping
-        level_mapping = {
-            'emerg': 'CRITICAL', 'emergency': 'CRITICAL', 'fatal': 'CRITICAL',
-            'alert': 'CRITICAL', 'crit': 'CRITICAL', 'critical': 'CRITICAL',
-            'err': 'ERROR', 'error': 'ERROR',
-            'warn': 'WARNING', 'warning': 'WARNING',
-            'notice': 'INFO', 'info': 'INFO', 'information': 'INFO',
-            'debug': 'DEBUG', 'trace': 'DEBUG'
-        }
-        
-        for i, line in enumerate(self.raw_logs):
-            parsed_entry = {
-                'timestamp': None,
-                'source_file': 'unknown',
-                'level': 'INFO',
-                'indicator_tags_list': [],
-                'ip_src': '',
-                'ip_dst': '',
-                'service': '',
-                'message': line,
-                'peer_port': None,
-                'line_number': i + 1,
-                'ip_src_valid': False,
-                'ip_dst_valid': False,
-                'message_raw': line,
-                'day_of_week': None,
-                'hour_of_day': None,
-                'is_weekend': False
-            }
-            
-            matched = False
-            # Try each pattern
-            for pattern in patterns[:-1]:  # Skip the fallback pattern for now
-                m = re.match(pattern, line)
-                if m:
-                    groups = m.groupdict()
-                    
-                    # Parse timestamp
-                    if 'timestamp' in groups and groups['timestamp']:
-                        try:
-                            ts_str = groups['timestamp']
-                            # Handle different timestamp formats
-                            if '/' in ts_str and ':' in ts_str:
-                                # Apache format: 10/Oct/2000:13:55:36 -0700
-                                ts = datetime.strptime(ts_str.split()[0], '%d/%b/%Y:%H:%M:%S')
-                            else:
-                                ts = date_parser.parse(ts_str)
-                            
-                            # Ensure timezone awareness
-                            if ts.tzinfo is None:
-                                ts = ts.replace(tzinfo=timezone.utc)
-                            parsed_entry['timestamp'] = ts.isoformat()
-                        except Exception:
-                            pass
-                    
-                    # Parse level
-                    if 'level' in groups and groups['level']:
-                        level = groups['level'].lower()
-                        parsed_entry['level'] = level_mapping.get(level, level.upper())
-                    
-                    # Extract IPs
-                    if 'ip' in groups and groups['ip']:
-                        ip = groups['ip']
-                        if self._is_valid_ip(ip):
-                            parsed_entry['ip_src'] = ip
-                            parsed_entry['ip_src_valid'] = True
-                    
-                    # Extract message
-                    if 'message' in groups and groups['message']:
-                        parsed_entry['message'] = groups['message']
-                        parsed_entry['message_raw'] = groups['message']
-                        
-                        # Extract additional IPs from message
-                        ips = re.findall(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', groups['message'])
-                        if len(ips) >= 1 and not parsed_entry['ip_src']:
-                            if self._is_valid_ip(ips[0]):
-                                parsed_entry['ip_src'] = ips[0]
-                                parsed_entry['ip_src_valid'] = True
-                        if len(ips) >= 2 and not parsed_entry['ip_dst']:
-                            if self._is_valid_ip(ips[1]):
-                                parsed_entry['ip_dst'] = ips[1]
-                                parsed_entry['ip_dst_valid'] = True
-                        
-                        # Extract port from message
-                        port_match = re.search(r'(?:port|Port)[\s:]+(\d+)|[:/](\d+)', groups['message'])
-                        if port_match:
-                            try:
-                                port = port_match.group(1) or port_match.group(2)
-                                parsed_entry['peer_port'] = int(port)
-                            except (ValueError, IndexError):
-                                pass
-                    
-                    # Extract service/process
-                    if 'process' in groups and groups['process']:
-                        parsed_entry['service'] = groups['process']
-                    elif 'source' in groups and groups['source']:
-                        parsed_entry['service'] = groups['source']
-                    
-                    matched = True
-                    successfully_parsed += 1
-                    break
-            
-            # If no pattern matched, use fallback
-            if not matched:
-                # Try to extract timestamp and level even from unstructured logs
-                ts_match = re.search(r'(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)', line)
-                if ts_match:
-                    try:
-                        ts = date_parser.parse(ts_match.group(1))
-                        # Ensure timezone awareness
-                        if ts.tzinfo is None:
-                            ts = ts.replace(tzinfo=timezone.utc)
-                        parsed_entry['timestamp'] = ts.isoformat()
-                    except Exception:
-                        pass
-                
-                level_match = re.search(r'\b(ERROR|WARN|WARNING|INFO|DEBUG|CRITICAL|FATAL)\b', line, re.IGNORECASE)
-                if level_match:
-                    level = level_match.group(1).upper()
-                    parsed_entry['level'] = level_mapping.get(level.lower(), level)
-                
-                # Extract IPs from any part of the line
-                ips = re.findall(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', line)
-                if ips:
-                    if self._is_valid_ip(ips[0]):
-                        parsed_entry['ip_src'] = ips[0]
-                        parsed_entry['ip_src_valid'] = True
-                    if len(ips) > 1 and self._is_valid_ip(ips[1]):
-                        parsed_entry['ip_dst'] = ips[1]
-                        parsed_entry['ip_dst_valid'] = True
-                
-                failed_parsing += 1
-            
-            # Extract indicator tags
-            indicators = self._extract_indicators(parsed_entry['message'])
-            parsed_entry['indicator_tags_list'] = indicators
-            
-            # Add temporal features if timestamp is available
-            if parsed_entry['timestamp']:
-                try:
-                    ts = date_parser.parse(parsed_entry['timestamp'])
-                    parsed_entry['day_of_week'] = ts.strftime('%A')
-                    parsed_entry['hour_of_day'] = ts.hour
-                    parsed_entry['is_weekend'] = ts.weekday() >= 5
-                except Exception:
-                    pass
-            
-            parsed.append(parsed_entry)
-        
-        df = pd.DataFrame(parsed)
+        lines = pd.Series(self.raw_logs, dtype=object)
+        fields = pd.DataFrame(index=lines.index, columns=['timestamp', 'level', 'ip', 'message', 'process', 'source'],
+                              dtype=object)
+        # Timestamp format of each line, known from the log format that matched it
+        ts_formats = pd.Series('ISO8601', index=lines.index, dtype=object)
+        unmatched = pd.Series(True, index=lines.index)
+
+        # Try each format, in order, on the lines no earlier format matched.
+        # Every format requires a timestamp, so that group marks a match.
+        for pattern, ts_format in _LOG_PATTERNS:
+            if not unmatched.any():
+                break
+            extracted = lines[unmatched].str.extract(pattern)
+            extracted = extracted[extracted['timestamp'].notna()]
+            columns = fields.columns.intersection(extracted.columns)
+            fields.loc[extracted.index, columns] = extracted[columns]
+            ts_formats[extracted.index] = ts_format
+            unmatched[extracted.index] = False
+        successfully_parsed = int((~unmatched).sum())
+        failed_parsing = int(unmatched.sum())
+
+        # Try to extract timestamp and level even from unstructured logs
+        if failed_parsing:
+            fallback = lines[unmatched]
+            fields.loc[unmatched, 'timestamp'] = fallback.str.extract(_TIMESTAMP_RE, expand=False)
+            # Only lines holding a level keyword as a plain substring need the regex
+            upper = fallback.str.upper()
+            has_level = np.logical_or.reduce([upper.str.contains(keyword, regex=False).to_numpy()
+                                              for keyword in _LEVEL_KEYWORDS])
+            fields.loc[unmatched, 'level'] = fallback.where(has_level).str.extract(_LEVEL_RE, expand=False)
+
+        # Lines without a (non-empty) structured message keep the full line
+        structured = fields['message'].where(fields['message'] != '')
+        has_message = structured.notna()
+        message = structured.fillna(lines)
+
+        # IPs come from structured messages and from unstructured lines
+        ips = message.where(has_message | unmatched).str.findall(_IP_RE)
+        # where() rather than fillna() between object columns, which warns about downcasting
+        ip_src = fields['ip'].where(fields['ip'].notna(), ips.str[0]).fillna('')
+        ip_dst = ips.str[1].fillna('')
+
+        # One regex pass over the structured messages; either alternative holds the port
+        ports = message.where(has_message).str.extract(_PORT_RE)
+
+        # Parse all timestamps in one pass; temporal features come from the
+        # local wall-clock time as written, and day codes are -1 where the
+        # timestamp is missing
+        ts = self._parse_timestamps(fields['timestamp'], ts_formats)
+        local = self._wall_clock(fields['timestamp'], ts_formats, ts)
+        day_codes = local.dt.dayofweek.fillna(-1).to_numpy(dtype=np.int8)
+
+        df = pd.DataFrame({
+            'timestamp': ts,
+            'source_file': 'unknown',
+            'level': self._normalize_levels(fields['level']),
+            'indicator_tags_list': self._extract_indicators(message),
+            'ip_src': ip_src,
+            'ip_dst': ip_dst,
+            'service': fields['process'].where(fields['process'].notna(), fields['source']).fillna(''),
+            'message': message,
+            'peer_port': pd.to_numeric(ports[0].where(ports[0].notna(), ports[1]), errors='coerce'),
+            'line_number': np.arange(1, len(lines) + 1),
+            'ip_src_valid': False,
+            'ip_dst_valid': False,
+            'message_raw': message,
+            'day_of_week': pd.Categorical.from_codes(day_codes, categories=_DAY_NAMES),
+            'hour_of_day': local.dt.hour,
+            'is_weekend': day_codes >= 5,
+        })
+        df = self._validate_ips(df)
         self._log_info(f"Enhanced normalization complete. Successfully parsed: {successfully_parsed}, Failed parsing: {failed_parsing}")
         self._log_info(f"Resulting DataFrame shape: {df.shape}")
         
         # Log some statistics
-        if 'timestamp' in df.columns:
+        if not df.empty:
             valid_timestamps = df['timestamp'].notna().sum()
             self._log_info(f"Entries with valid timestamps: {valid_timestamps}/{len(df)} ({100*valid_timestamps/len(df):.1f}%)")
         
         return df
     
-    def _is_valid_ip(self, ip: str) -> bool:
-        """Check if IP address is valid."""
-        if not ip:
-            return False
-        try:
-            ipaddress.ip_address(ip)
-            return True
-        except ValueError:
-            return False
+    def _normalize_parallel(self, workers: int, chunk_size: int) -> pd.DataFrame:
+        """Normalize raw logs chunk by chunk across worker processes, keeping line order."""
+        chunks = [self.raw_logs[i:i + chunk_size] for i in range(0, len(self.raw_logs), chunk_size)]
+        self._log_info(f"Normalizing {len(self.raw_logs)} raw log entries in {len(chunks)} chunks "
+                       f"across {workers} worker processes")
+
+        # Every line is normalized on its own, so chunks are independent
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            frames = list(executor.map(_normalize_chunk, chunks))
+        df = pd.concat(frames, ignore_index=True)
+        df['line_number'] = np.arange(1, len(df) + 1)
+
+        valid_timestamps = df['timestamp'].notna().sum()
+        self._log_info(f"Resulting DataFrame shape: {df.shape}")
+        self._log_info(f"Entries with valid timestamps: {valid_timestamps}/{len(df)} ({100*valid_timestamps/len(df):.1f}%)")
+        return df
+
+    def _normalize_levels(self, levels: pd.Series) -> pd.Series:
+        """Map raw level strings to canonical levels, defaulting to INFO."""
+        # Only a handful of distinct raw levels exist, so normalize those and map back
+        canonical = {level: _LEVEL_MAPPING.get(level.lower(), level.upper()) for level in levels.dropna().unique()}
+        return levels.map(canonical).fillna('INFO')
+
+    def _parse_timestamps(self, raw: pd.Series, formats: pd.Series) -> pd.Series:
+        """Parse raw timestamp strings to UTC datetimes; unparseable values become NaT.
+
+        ``formats`` holds the expected format of each row, so every group of rows
+        is parsed with one fixed-format call instead of per-value inference.
+        """
+        ts = pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns, UTC]')
+        present = raw.notna()
+        for ts_format in formats[present].unique():
+            rows = present & (formats == ts_format)
+            values = raw[rows]
+            if ts_format == _APACHE_TIMESTAMP_FORMAT:
+                # 10/Oct/2000:13:55:36 -0700 (offset ignored, read as UTC)
+                values = values.str.replace(_APACHE_OFFSET_RE, '', regex=True)
+            elif ts_format == _SYSLOG_TIMESTAMP_FORMAT:
+                values = f"{datetime.now().year} " + values
+            elif ts_format == 'ISO8601':
+                # pandas gives naive values the offset of zoned ones parsed in the
+                # same call, so zoned and naive values are parsed separately
+                zoned = values.str.contains(_TZ_SUFFIX_RE)
+                for part in (values[zoned], values[~zoned]):
+                    if not part.empty:
+                        ts[part.index] = pd.to_datetime(part, utc=True, errors='coerce', format=ts_format)
+                continue
+            ts[rows] = pd.to_datetime(values, utc=True, errors='coerce', format=ts_format)
+
+        # Values that do not follow their expected format get one inference pass
+        retry = present & ts.isna()
+        if retry.any():
+            values = raw[retry]
+            # Apache offsets stay ignored, so those stamps still read as written
+            apache = formats[retry] == _APACHE_TIMESTAMP_FORMAT
+            values = values.where(~apache, values.str.replace(_APACHE_OFFSET_RE, '', regex=True))
+            ts[retry] = pd.to_datetime(values, utc=True, errors='coerce', format='mixed')
+        return ts
+
+    def _wall_clock(self, raw: pd.Series, formats: pd.Series, ts: pd.Series) -> pd.Series:
+        """Local wall-clock times: the UTC instants shifted back by any zone offset the raw value carried."""
+        local = ts.dt.tz_localize(None)
+        # Apache offsets are already ignored when parsing, so those rows read as written
+        offsets = raw.where(ts.notna() & (formats != _APACHE_TIMESTAMP_FORMAT)).str.extract(_TZ_OFFSET_RE)
+        zoned = offsets[0].notna()
+        if zoned.any():
+            offsets = offsets[zoned]
+            minutes = offsets[1].astype(int) * 60 + offsets[2].astype(int)
+            minutes = minutes.where(offsets[0] == '+', -minutes)
+            shift = pd.to_timedelta(minutes.reindex(local.index, fill_value=0), unit='m')
+            local = local + shift
+        return local
+
+    def _validate_ips(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Blank invalid ip_src/ip_dst values and set their *_valid flags column-wise."""
+        for col in ('ip_src', 'ip_dst'):
+            # The octet ranges are encoded in the pattern, so this is a single pass
+            valid = df[col].str.fullmatch(_VALID_IPV4_RE, na=False)
+            df[col] = df[col].where(valid, '')
+            df[f'{col}_valid'] = valid
+        return df
     
-    def _extract_indicators(self, message: str) -> List[str]:
-        """Extract indicator tags from message."""
-        if not message:
-            return []
-        
-        indicators = []
-        message_lower = message.lower()
-        
-        # Error indicators
-        if re.search(r'\b(error|failed|failure|invalid|exception)\b', message_lower):
-            indicators.append('error')
-        
-        # Warning indicators
-        if re.search(r'\b(warning|warn|attention)\b', message_lower):
-            indicators.append('warning')
-        
-        # Success indicators
-        if re.search(r'\b(success|successful|completed|ok)\b', message_lower):
-            indicators.append('success')
-        
-        # Security indicators
-        if re.search(r'\b(security|auth|authentication|permission|login|logout)\b', message_lower):
-            indicators.append('security')
-        
-        # Network indicators
-        if re.search(r'\b(connect|disconnect|receive|send|packet)\b', message_lower):
-            indicators.append('network')
-        
-        return indicators
+    def _extract_indicators(self, messages: pd.Series) -> List[List[str]]:
+        """Extract indicator tags for each message."""
+        # A single scan finds every keyword; tags are then listed in canonical order
+        lowered = messages.str.lower()
+        if _INDICATOR_AUTOMATON is not None:
+            found_tags = (_automaton_tags(message) for message in lowered)
+        else:
+            found_tags = ({_KEYWORD_TAGS[keyword] for keyword in row} for row in lowered.str.findall(_INDICATOR_RE))
+        tags = list(_INDICATOR_KEYWORDS)
+        return [[tag for tag in tags if tag in found] if found else [] for found in found_tags]
 
-    def save_output(self, df: pd.DataFrame, output_dir: str = "oplogs/csv/", filename: str = "parsed_logs"):
-        """Save the parsed DataFrame to CSV and JSON formats."""
+    def save_output(self, df: pd.DataFrame, output_dir: str = "oplogs/csv/", filename: str = "parsed_logs",
+                    write_json: bool = False, write_csv: bool = True, write_parquet: bool = False):
+        """Save the parsed DataFrame to CSV and/or Parquet, optionally mirroring it to line-delimited JSON.
+
+        Returns False, without writing anything, if a requested output cannot be produced.
+        """
+        if write_parquet and not PYARROW_AVAILABLE:
+            self._log_error("pyarrow is not installed; cannot write Parquet output")
+            return False
         try:
             # Create output directory
             Path(output_dir).mkdir(parents=True, exist_ok=True)
             
             # Save as CSV
-            csv_path = Path(output_dir) / f"{filename}.csv"
-            df.to_csv(csv_path, index=False)
-            self._log_info(f"Saved parsed logs to {csv_path}")
+            if write_csv:
+                csv_path = Path(output_dir) / f"{filename}.csv"
+                df.to_csv(csv_path, index=False)
+                self._log_info(f"Saved parsed logs to {csv_path}")
+            
+            # Columnar copy for analytics; keeps tag lists and categoricals typed
+            if write_parquet:
+                parquet_path = Path(output_dir) / f"{filename}.parquet"
+                df.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+                self._log_info(f"Saved parsed logs to {parquet_path}")
             
-            # Save as JSON
-            json_path = Path(output_dir) / f"{filename}.json"
-            df.to_json(json_path, orient='records', lines=True)
-            self._log_info(f"Saved parsed logs to {json_path}")
+            # The JSON copy holds the same rows; only write it when asked for
+            if write_json:
+                json_path = Path(output_dir) / f"{filename}.json"
+                df.to_json(json_path, orient='records', lines=True, date_format='iso')
+                self._log_info(f"Saved parsed logs to {json_path}")
             
             return True
         except Exception as e:
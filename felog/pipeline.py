@@ -45,10 +45,11 @@ class LogFeaturePipeline:
     def parse(self) -> pd.DataFrame:
         """Run normalization and keep a copy of the parsed DataFrame."""
         df = self.parser.normalize()
-        # Ensure timestamp column is parsed to pandas datetime
-        if 'timestamp' in df.columns:
+        # Ensure timestamp column is parsed to pandas datetime; the parser
+        # already returns datetimes, other sources use the ISO8601 fast path
+        if 'timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
             try:
-                df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True, errors='coerce')
+                df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True, errors='coerce', format='ISO8601')
             except Exception:
                 df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
         # Map parser columns to expected feature engineering column names
@@ -35,7 +35,7 @@ class AutoencoderTrainer:
         self.optimizer = optim.Adam(self.model.parameters(), lr=1e-3)
 
     def train(self, numeric_df, epochs=20):
-        X = torch.tensor(numeric_df.values, dtype=torch.float32)
+        X = torch.from_numpy(numeric_df.to_numpy(dtype=np.float32))
         self.model.train()
         for epoch in range(epochs):
             self.optimizer.zero_grad()
@@ -50,7 +50,7 @@ class AutoencoderTrainer:
         print("[+] Autoencoder trained and saved.")
 
     def predict(self, numeric_df):
-        X = torch.tensor(numeric_df.values, dtype=torch.float32)
+        X = torch.from_numpy(numeric_df.to_numpy(dtype=np.float32))
         self.model.eval()
         with torch.no_grad():
             reconstructed = self.model(X)
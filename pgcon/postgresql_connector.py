@@ -1,21 +1,38 @@
-import pandas as pd
-from typing import List, Dict, Any, Optional
+import importlib.util
+import io
+import re
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Iterator
 import logging
 
+# pandas and psycopg2 are imported where they are used, so importing
+# pgcon stays cheap for code that never loads data
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Try to import PostgreSQL dependencies, but handle gracefully if not available
-try:
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    POSTGRES_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"PostgreSQL dependencies not available: {e}")
-    POSTGRES_AVAILABLE = False
-    psycopg2 = None
-    RealDictCursor = None
+# Check for PostgreSQL dependencies without importing them
+POSTGRES_AVAILABLE = importlib.util.find_spec("psycopg2") is not None
+if not POSTGRES_AVAILABLE:
+    logger.warning("PostgreSQL dependencies not available: psycopg2 is not installed")
+
+_POSTGRES_UNAVAILABLE_MESSAGE = ("PostgreSQL dependencies not available. "
+                                 "Please install psycopg2 package for full functionality. "
+                                 "Current version supports CSV processing only.")
+
+
+def _import_postgres(module_name: str):
+    """Import a psycopg2 module, reporting a broken install (e.g. no libpq) like a missing one."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(_POSTGRES_UNAVAILABLE_MESSAGE) from e
+
+# INSERT ... VALUES %s takes a whole list of rows through execute_values
+_VALUES_LIST_RE = re.compile(r'\bVALUES\s+%s', re.IGNORECASE)
+
 
 class Pgcon:
     """
@@ -46,6 +63,7 @@ class Pgcon:
         self.password = password
         self.connection = None
         self.data = None
+        self._cursor = None
         
         if not POSTGRES_AVAILABLE:
             logger.info("Running in CSV-only mode. Install psycopg2 for full functionality.")
@@ -53,9 +71,7 @@ class Pgcon:
     def _check_postgres_availability(self):
         """Check if PostgreSQL dependencies are available."""
         if not POSTGRES_AVAILABLE:
-            raise ImportError("PostgreSQL dependencies not available. "
-                             "Please install psycopg2 package for full functionality. "
-                             "Current version supports CSV processing only.")
+            raise ImportError(_POSTGRES_UNAVAILABLE_MESSAGE)
     
     def load_csv_data(self, file_path: str, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
@@ -69,7 +85,23 @@ class Pgcon:
         Returns:
             List[Dict[str, Any]]: List of rows as dictionaries
         """
+        return self.load_csv_frame(file_path, columns).to_dict('records')
+    
+    def load_csv_frame(self, file_path: str, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+        """
+        Load data from CSV file into a DataFrame, without building row dictionaries.
+        
+        Args:
+            file_path (str): Path to the CSV file
+            columns (Optional[List[str]]): List of specific columns to load. 
+                                          If None, loads all columns.
+        
+        Returns:
+            pd.DataFrame: The loaded rows; use records() to iterate them as dictionaries
+        """
         try:
+            import pandas as pd
+            
             # Read CSV file
             if columns:
                 # Read only specified columns
@@ -78,8 +110,8 @@ class Pgcon:
                 # Read all columns
                 df = pd.read_csv(file_path)
             
-            # Convert to list of dictionaries
-            self.data = df.to_dict('records')
+            # Keep the columnar frame; row dictionaries are built on demand by records()
+            self.data = df
             
             logger.info(f"Successfully loaded {len(self.data)} rows from {file_path}")
             if columns:
@@ -96,13 +128,29 @@ class Pgcon:
             logger.error(f"Error loading CSV data: {str(e)}")
             raise
     
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the loaded CSV rows as dictionaries.
+        
+        Yields:
+            Dict[str, Any]: One row at a time, keyed by column name.
+        """
+        if self.data is None:
+            return
+        columns = list(self.data.columns)
+        for row in self.data.itertuples(index=False, name=None):
+            yield dict(zip(columns, row))
+    
     def connect(self) -> None:
         """
         Establish connection to the PostgreSQL database.
         """
         self._check_postgres_availability()
+        psycopg2 = _import_postgres("psycopg2")
         
         try:
+            # A fresh connection needs its own cursor
+            self._cursor = None
             self.connection = psycopg2.connect(
                 host=self.host,
                 port=self.port,
@@ -115,6 +163,28 @@ class Pgcon:
             logger.error(f"Failed to connect to PostgreSQL: {str(e)}")
             raise
     
+    def _get_cursor(self):
+        """Return the connection's shared RealDictCursor, creating it on first use."""
+        if not self.connection:
+            self.connect()
+        if self._cursor is None or self._cursor.closed:
+            extras = _import_postgres("psycopg2.extras")
+            self._cursor = self.connection.cursor(cursor_factory=extras.RealDictCursor)
+        return self._cursor
+    
+    def _collect_results(self, cursor, returns_rows: bool) -> List[Dict[str, Any]]:
+        """Fetch rows from a query, or commit a write and report the affected row count."""
+        if returns_rows:
+            # Convert to list of dictionaries
+            rows = [dict(row) for row in cursor.fetchall()]
+            logger.info(f"Executed query and fetched {len(rows)} rows")
+            return rows
+        # For INSERT, UPDATE, DELETE, etc., commit and return affected rows
+        self.connection.commit()
+        affected_rows = cursor.rowcount
+        logger.info(f"Executed query affecting {affected_rows} rows")
+        return [{"affected_rows": affected_rows}]
+    
     def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """
         Execute a SQL query and return results.
@@ -128,33 +198,61 @@ class Pgcon:
         """
         self._check_postgres_availability()
         
-        if not self.connection:
-            self.connect()
-            
         try:
-            cursor = self.connection.cursor(cursor_factory=RealDictCursor)
+            cursor = self._get_cursor()
             cursor.execute(query, params)
             
             # If it's a SELECT query, fetch results
-            if query.strip().upper().startswith('SELECT'):
-                results = cursor.fetchall()
-                # Convert to list of dictionaries
-                rows = [dict(row) for row in results]
-                logger.info(f"Executed query and fetched {len(rows)} rows")
-                return rows
-            else:
-                # For INSERT, UPDATE, DELETE, etc., commit and return affected rows
-                self.connection.commit()
-                affected_rows = cursor.rowcount
-                logger.info(f"Executed query affecting {affected_rows} rows")
-                return [{"affected_rows": affected_rows}]
+            return self._collect_results(cursor, query.strip().upper().startswith('SELECT'))
                 
         except Exception as e:
             logger.error(f"Failed to execute query: {str(e)}")
             raise
-        finally:
-            if cursor:
-                cursor.close()
+    
+    def prepare(self, name: str, query: str) -> None:
+        """
+        Create a server-side prepared statement so repeated runs skip parsing and planning.
+        
+        Args:
+            name (str): Name of the prepared statement.
+            query (str): SQL statement using $1, $2, ... placeholders.
+        """
+        self._check_postgres_availability()
+        
+        try:
+            self._get_cursor().execute(f"PREPARE {name} AS {query}")
+            logger.info(f"Prepared statement {name}")
+        except Exception as e:
+            logger.error(f"Failed to prepare statement {name}: {str(e)}")
+            raise
+    
+    def run(self, name: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a statement created with prepare().
+        
+        Args:
+            name (str): Name of the prepared statement.
+            params (Optional[tuple]): Values for the statement's placeholders.
+            
+        Returns:
+            List[Dict[str, Any]]: Query results as list of dictionaries.
+        """
+        self._check_postgres_availability()
+        
+        try:
+            cursor = self._get_cursor()
+            if params:
+                placeholders = ", ".join(["%s"] * len(params))
+                cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+            
+            # Only statements that return rows leave a result description
+            return self._collect_results(cursor, cursor.description is not None)
+            
+        except Exception as e:
+            logger.error(f"Failed to run prepared statement {name}: {str(e)}")
+            raise
     
     def create_table_from_csv(self, file_path: str, table_name: str, 
                              columns: Optional[List[str]] = None) -> None:
@@ -173,11 +271,15 @@ class Pgcon:
             self.connect()
             
         try:
-            # Load CSV data to infer schema
+            import pandas as pd
+            
+            # Load CSV data to infer schema. Only empty fields count as missing,
+            # the same as for COPY, so a column holding tokens like "NA" or
+            # "null" is typed TEXT rather than numeric
             if columns:
-                df = pd.read_csv(file_path, usecols=columns)
+                df = pd.read_csv(file_path, usecols=columns, keep_default_na=False, na_values=[''])
             else:
-                df = pd.read_csv(file_path)
+                df = pd.read_csv(file_path, keep_default_na=False, na_values=[''])
             
             # Infer PostgreSQL column types from pandas dtypes
             column_definitions = []
@@ -188,12 +290,8 @@ class Pgcon:
                 elif pd.api.types.is_float_dtype(dtype):
                     pg_type = "DOUBLE PRECISION"
                 else:
-                    # For object/string types, estimate max length
-                    max_length = df[col].astype(str).str.len().max()
-                    if max_length < 255:
-                        pg_type = f"VARCHAR({max_length + 10})"
-                    else:
-                        pg_type = "TEXT"
+                    # TEXT stores and performs like VARCHAR(n), so no length scan is needed
+                    pg_type = "TEXT"
                 
                 column_definitions.append(f"{col} {pg_type}")
             
@@ -203,30 +301,106 @@ class Pgcon:
             self.execute_query(create_query)
             logger.info(f"Created table {table_name}")
             
-            # Insert data using pandas to_sql method
-            df.to_sql(table_name, self.connection, if_exists='append', index=False)
+            # Bulk load with a single COPY; the file streams as is unless only
+            # some of its columns are wanted
+            if columns:
+                buffer = io.StringIO()
+                df.to_csv(buffer, index=False)
+                buffer.seek(0)
+                self._copy_csv(table_name, list(df.columns), buffer)
+            else:
+                with open(file_path, 'rb') as f:
+                    self._copy_csv(table_name, list(df.columns), f)
             logger.info(f"Inserted {len(df)} rows into {table_name}")
             
         except Exception as e:
             logger.error(f"Failed to create table from CSV: {str(e)}")
             raise
     
-    def insert_dataframe(self, df: pd.DataFrame, table_name: str) -> None:
+    def _copy_csv(self, table_name: str, columns: List[str], csv_file) -> None:
         """
-        Insert data from a pandas DataFrame into a PostgreSQL table.
+        Stream CSV data (with a header row) into a table using COPY.
         
         Args:
-            df (pd.DataFrame): DataFrame containing the data to insert.
             table_name (str): Name of the target table.
+            columns (List[str]): The CSV's columns, in file order.
+            csv_file: File-like object holding the CSV text or bytes.
+        """
+        cursor = self.connection.cursor()
+        try:
+            # COPY maps fields by position, so name the columns to match an
+            # existing table whose column order differs from the file's
+            cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN "
+                               "WITH (FORMAT csv, HEADER true)", csv_file)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def execute_many(self, query: str, seq_of_params, page_size: int = 1000) -> int:
+        """
+        Execute a statement for every parameter set in a batch.
+        
+        INSERT statements written as ``INSERT ... VALUES %s`` are sent through
+        psycopg2's execute_values, which packs up to page_size rows into each
+        statement; anything else falls back to cursor.executemany.
+        
+        Args:
+            query (str): SQL statement to execute.
+            seq_of_params: Iterable of parameter tuples, one per row.
+            page_size (int): Maximum number of rows per INSERT statement.
+            
+        Returns:
+            int: Number of parameter sets executed.
         """
         self._check_postgres_availability()
         
         if not self.connection:
             self.connect()
-            
+        
+        execute_values = _import_postgres("psycopg2.extras").execute_values
+        
+        # Count parameter sets as the driver consumes them, so the batch
+        # streams through without being copied into a list first
+        executed = 0
+        
+        def params():
+            nonlocal executed
+            for row in seq_of_params:
+                executed += 1
+                yield row
+        
+        cursor = self.connection.cursor()
+        try:
+            if query.strip().upper().startswith('INSERT') and _VALUES_LIST_RE.search(query):
+                execute_values(cursor, query, params(), page_size=page_size)
+            else:
+                cursor.executemany(query, params())
+            self.connection.commit()
+            logger.info(f"Executed batch of {executed} parameter sets")
+            return executed
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Failed to execute batch: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+    
+    def insert_dataframe(self, df: "pd.DataFrame", table_name: str) -> None:
+        """
+        Insert data from a pandas DataFrame into a PostgreSQL table.
+        
+        Args:
+            df (pd.DataFrame): DataFrame containing the data to insert.
+            table_name (str): Name of the target table.
+        """
         try:
-            # Insert data using pandas to_sql method
-            df.to_sql(table_name, self.connection, if_exists='append', index=False)
+            # Missing values become None so they are written as NULL
+            rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            columns = ", ".join(df.columns)
+            self.execute_many(f"INSERT INTO {table_name} ({columns}) VALUES %s", rows)
             logger.info(f"Successfully inserted {len(df)} rows from DataFrame into {table_name}")
             
         except Exception as e:
@@ -241,6 +415,9 @@ class Pgcon:
             return
             
         try:
+            if self._cursor is not None:
+                self._cursor.close()
+                self._cursor = None
             self.connection.close()
             logger.info("PostgreSQL connection closed")
         except Exception as e:
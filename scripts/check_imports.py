@@ -1,8 +1,24 @@
-import importlib
+import subprocess
+import sys
 packages = ['torch','joblib','pandas','numpy','sklearn','pyod','scapy','prettytable','tensorflow','cassandra']
-for pkg in packages:
-    try:
-        importlib.import_module(pkg)
-        print('OK:',pkg)
-    except Exception as e:
-        print('MISSING:',pkg,'->', type(e).__name__, e)
+
+# Runs in a fresh interpreter and reports a failed import as its last stdout line
+PROBE = '''import importlib, sys
+try:
+    importlib.import_module(sys.argv[1])
+except Exception as e:
+    print(type(e).__name__, e)
+    sys.exit(1)
+'''
+
+# Each package is imported in its own process, so the probes run concurrently
+# without sharing module import locks (numpy, scipy, protobuf) across threads
+procs = [subprocess.Popen([sys.executable, '-c', PROBE, pkg], stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, text=True) for pkg in packages]
+for pkg, proc in zip(packages, procs):
+    out, _ = proc.communicate()
+    if proc.returncode == 0:
+        print('OK:', pkg)
+    else:
+        lines = out.strip().splitlines()
+        print('MISSING:', pkg, '->', lines[-1] if lines else f'exit code {proc.returncode}')
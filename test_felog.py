@@ -5,10 +5,19 @@ Test script to verify felog module functionality
 
 import sys
 import os
+import glob
+import math
+import tempfile
 
 # Add the parent directory to the path so we can import felog
 sys.path.insert(0, os.path.abspath('.'))
 
+import pandas as pd
+import pytest
+
+from felog import LogParser
+
+
 def test_imports():
     """Test that we can import the felog module and its classes."""
     try:
@@ -49,5 +58,225 @@ def test_imports():
         print(f"✗ Error: {e}")
         return False
 
+def _entropy(counts):
+    """Shannon entropy (bits) of a token count distribution."""
+    total = sum(counts)
+    return -sum(c / total * math.log2(c / total) for c in counts)
+
+def test_feature_windows():
+    """Check get_features against a small hand-computed frame."""
+    import pandas as pd
+    from felog import FeatureEngineering
+    
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime([
+            '2025-01-01 00:03:15', '2025-01-01 00:00:30', None,
+            '2025-01-01 00:00:10', '2025-01-01 00:00:50', '2025-01-01 00:03:40',
+        ]),
+        'message': ['!!!', 'Failed password for root', 'dropped row',
+                    'Failed password for invalid user bob', 'Failed password for root', '---'],
+        'host': ['h1', None, 'h9', 'h1', 'h2', 'h1'],
+        'process': ['cron', 'sshd', 'x', 'sshd', None, 'cron'],
+    })
+    features = FeatureEngineering(df, window_seconds=60, enable_logging=False).get_features()
+    
+    # The NaT row is dropped and windows 1 and 2 hold no events, so only
+    # windows 0 and 3 (counted from the first event) are returned
+    assert len(features) == 2
+    assert list(features['window_start']) == [pd.Timestamp('2025-01-01 00:00:10'),
+                                              pd.Timestamp('2025-01-01 00:03:10')]
+    assert list(features['window_end']) == [pd.Timestamp('2025-01-01 00:01:10'),
+                                            pd.Timestamp('2025-01-01 00:04:10')]
+    assert list(features['event_count']) == [3, 2]
+    assert list(features['unique_messages']) == [2, 2]
+    # Missing hosts and processes are not counted as distinct values
+    assert list(features['distinct_hosts']) == [2, 1]
+    assert list(features['distinct_processes']) == [1, 1]
+    assert list(features['avg_msg_length']) == [(36 + 24 + 24) / 3, 3.0]
+    assert list(features['failed_auth_count']) == [3, 0]
+    assert list(features['invalid_user_count']) == [1, 0]
+    # failed, password, for: 3 each; root: 2; invalid, user, bob: 1 each.
+    # Messages without any tokens give an entropy of 0
+    assert math.isclose(features['entropy_tokens'][0], _entropy([3, 3, 3, 2, 1, 1, 1]))
+    assert features['entropy_tokens'][1] == 0.0
+    print("✓ Feature windows match the hand-computed values")
+
+def test_entropy_without_tokens():
+    """Entropy stays a float column when no message holds a token."""
+    import pandas as pd
+    from felog import FeatureEngineering
+
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2025-01-01 00:00:00', '2025-01-01 00:02:00']),
+        'message': ['!!!', None],
+        'host': ['h1', 'h2'],
+        'process': ['cron', 'sshd'],
+    })
+    features = FeatureEngineering(df, window_seconds=60, enable_logging=False).get_features()
+    assert features['entropy_tokens'].dtype == 'float64'
+    assert list(features['entropy_tokens']) == [0.0, 0.0]
+
+
+EDGE_LINES = [
+    '192.168.1.20 - - [10/Oct/2000:13:55:36 -0700] "GET /a.gif HTTP/1.0" 200 2326 "-" "Mozilla"',
+    'Jun 14 15:16:01 combo sshd(pam_unix)[19939]: authentication failure; rhost=218.188.2.4 port 22',
+    'TimeGenerated: 2016-09-28 04:30:30, EventID: 4624, Level: Information, Source: Security, '
+    'Message: An account was successfully logged on from 10.0.0.5',
+    '2023-06-10T23:30:00+05:00 [WARN] disk almost full',
+    'kernel panic ERROR from 300.1.1.1 and 10.1.1.1',
+]
+
+
+def _normalize(lines, **kwargs):
+    parser = LogParser(enable_logging=False)
+    parser.raw_logs = list(lines)
+    return parser.normalize(**kwargs)
+
+
+def test_normalize_edge_lines():
+    """Each supported format, an offset ISO timestamp and an unstructured line."""
+    df = _normalize(EDGE_LINES)
+    assert len(df) == len(EDGE_LINES)
+    assert list(df['line_number']) == [1, 2, 3, 4, 5]
+
+    apache, syslog, windows, iso, unstructured = (df.iloc[i] for i in range(5))
+
+    # Apache: the zone offset is ignored, so the time reads as written
+    assert apache['timestamp'] == pd.Timestamp('2000-10-10 13:55:36', tz='UTC')
+    assert apache['ip_src'] == '192.168.1.20' and apache['ip_src_valid']
+    assert apache['hour_of_day'] == 13 and apache['day_of_week'] == 'Tuesday'
+
+    # Syslog carries no year; month, day and time come from the line
+    assert (syslog['timestamp'].month, syslog['timestamp'].day, syslog['hour_of_day']) == (6, 14, 15)
+    assert syslog['service'] == 'sshd(pam_unix)[19939]'
+    assert syslog['ip_src'] == '218.188.2.4'
+    assert syslog['peer_port'] == 22
+    assert syslog['indicator_tags_list'] == ['error', 'security']
+
+    # Windows event log
+    assert windows['timestamp'] == pd.Timestamp('2016-09-28 04:30:30', tz='UTC')
+    assert windows['level'] == 'INFO' and windows['service'] == 'Security'
+    assert windows['ip_src'] == '10.0.0.5'
+
+    # Offset ISO: the timestamp is the UTC instant, temporal fields use local time
+    assert iso['timestamp'] == pd.Timestamp('2023-06-10 18:30:00', tz='UTC')
+    assert iso['level'] == 'WARNING'
+    assert iso['hour_of_day'] == 23
+    assert iso['day_of_week'] == 'Saturday' and iso['is_weekend']
+
+    # Unstructured: no timestamp, level found by keyword, invalid IPs blanked
+    assert pd.isna(unstructured['timestamp'])
+    assert unstructured['level'] == 'ERROR'
+    assert unstructured['ip_src'] == '' and not unstructured['ip_src_valid']
+    assert unstructured['ip_dst'] == '10.1.1.1' and unstructured['ip_dst_valid']
+    assert unstructured['message'] == EDGE_LINES[4]
+
+
+def test_features_from_normalize():
+    """A normalize frame feeds get_features, with source_file and service as host and process."""
+    from felog import FeatureEngineering
+
+    features = FeatureEngineering(_normalize(EDGE_LINES), window_seconds=60, enable_logging=False).get_features()
+    assert list(features['event_count']) == [1, 1, 1, 1]
+    assert list(features['distinct_hosts']) == [1, 1, 1, 1]
+    assert list(features['distinct_processes']) == [1, 1, 1, 1]
+
+
+def test_naive_iso_after_offset_iso():
+    """A naive ISO timestamp is read as written, whatever zoned lines precede it."""
+    lines = ['2024-01-06T23:30:00+05:00 [ERROR] x', '2024-01-06 10:00:00 [warn] hi',
+             '2024-01-06T08:00:00Z [INFO] z']
+    for ordered in (lines, lines[::-1]):
+        df = _normalize(ordered).set_index('message')
+        assert df.loc['x', 'timestamp'] == pd.Timestamp('2024-01-06 18:30:00', tz='UTC')
+        assert df.loc['hi', 'timestamp'] == pd.Timestamp('2024-01-06 10:00:00', tz='UTC')
+        assert df.loc['hi', 'hour_of_day'] == 10
+        assert df.loc['z', 'timestamp'] == pd.Timestamp('2024-01-06 08:00:00', tz='UTC')
+
+
+def test_apache_nonstandard_timestamp():
+    """An Apache line with an ISO style stamp is parsed as written, offset or not."""
+    request = ' "GET / HTTP/1.0" 200 1 "-" "-"'
+    df = _normalize(['1.2.3.4 - - [2000-10-10 13:55:36]' + request,
+                     '1.2.3.4 - - [2000-10-10 13:55:36 -0700]' + request])
+    assert list(df['timestamp']) == [pd.Timestamp('2000-10-10 13:55:36', tz='UTC')] * 2
+    assert list(df['hour_of_day']) == [13, 13]
+    assert list(df['day_of_week']) == ['Tuesday', 'Tuesday']
+
+
+def test_normalize_empty_input():
+    """No raw logs give an empty frame with the normalized columns."""
+    df = _normalize([])
+    assert df.empty
+    assert 'timestamp' in df.columns and 'is_weekend' in df.columns
+
+
+def test_parallel_normalize_matches_serial():
+    """Chunked normalization in worker processes gives the serial result."""
+    lines = EDGE_LINES * 40
+    serial = _normalize(lines)
+    parallel = _normalize(lines, workers=2, chunk_size=50)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_read_byte_order_marks():
+    """UTF-16 files are decoded and a UTF-8 BOM does not stick to the first line."""
+    parser = LogParser(enable_logging=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        utf16 = os.path.join(tmp, 'utf16.log')
+        with open(utf16, 'w', encoding='utf-16') as f:
+            f.write('2024-01-01 10:00:00 [ERROR] first\r\n\r\nsecond\r\n')
+        utf8_bom = os.path.join(tmp, 'utf8_bom.log')
+        with open(utf8_bom, 'w', encoding='utf-8-sig') as f:
+            f.write('2024-01-01 10:00:00 [ERROR] first\nsecond\n')
+
+        expected = ['2024-01-01 10:00:00 [ERROR] first', 'second']
+        assert parser._read_lines(utf16) == expected
+        assert parser._read_lines(utf8_bom) == expected
+
+
+def test_indicator_automaton_matches_regex():
+    """The Aho-Corasick path tags exactly what the \\b-bounded regex tags."""
+    pytest.importorskip("ahocorasick")
+    import felog.parser as parser_module
+
+    messages = [
+        'warn inside warning', 'warning: low disk', 'rewarned', 'ok!', '_ok', 'ok_', 'login_',
+        '(login)', 'error²', '²error', 'ERROR-failed', 'disconnected', 'connect/disconnect',
+        'tokens', 'ok', '', 'auth.log: authentication failure', 'erreur', 'Ok. Sent packet',
+    ]
+    for path in sorted(glob.glob(os.path.join('logs', '*.log'))):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            messages.extend(f.read().splitlines())
+    messages = pd.Series(messages)
+
+    parser = LogParser(enable_logging=False)
+    automaton = parser_module._INDICATOR_AUTOMATON
+    assert automaton is not None
+    with_automaton = parser._extract_indicators(messages)
+    parser_module._INDICATOR_AUTOMATON = None
+    try:
+        with_regex = parser._extract_indicators(messages)
+    finally:
+        parser_module._INDICATOR_AUTOMATON = automaton
+
+    assert with_automaton == with_regex
+    assert with_automaton[:10] == [['warning'], ['warning'], [], ['success'], [], [], [],
+                                   ['security'], [], []]
+
+
 if __name__ == "__main__":
-    test_imports()
\ No newline at end of file
+    test_imports()
+    test_feature_windows()
+    test_entropy_without_tokens()
+    test_normalize_edge_lines()
+    test_features_from_normalize()
+    test_naive_iso_after_offset_iso()
+    test_apache_nonstandard_timestamp()
+    test_normalize_empty_input()
+    test_parallel_normalize_matches_serial()
+    test_read_byte_order_marks()
+    try:
+        test_indicator_automaton_matches_regex()
+    except pytest.skip.Exception as e:
+        print(f"- test_indicator_automaton_matches_regex skipped: {e}")
@@ -2,9 +2,18 @@
 Test script to verify Pgcon module import and functionality.
 """
 
+import sys
+import os
+import types
+import tempfile
+import importlib.machinery
+
+import pandas as pd
+import pytest
+
 # Test direct import
 from pgcon import Pgcon
-import pandas as pd
+import pgcon.postgresql_connector as pg_module
 
 def test_basic_import():
     """Test that we can import Pgcon directly."""
@@ -57,7 +66,7 @@ def test_method_availability():
     
     expected_methods = [
         'connect', 'execute_query', 'create_table_from_csv', 
-        'insert_dataframe', 'close', 'load_csv_data'
+        'insert_dataframe', 'close', 'load_csv_data', 'load_csv_frame'
     ]
     
     for method in expected_methods:
@@ -66,6 +75,177 @@ def test_method_availability():
         else:
             print(f"[ERROR] Method '{method}' is missing")
 
+def test_records():
+    """load_csv_data returns row dictionaries; load_csv_frame and records() keep the frame."""
+    pgcon = Pgcon()
+    rows = [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'rows.csv')
+        pd.DataFrame(rows).to_csv(csv_path, index=False)
+        data = pgcon.load_csv_data(csv_path)
+        assert data == rows and data[0] == rows[0]
+        assert list(pgcon.records()) == rows
+
+        df = pgcon.load_csv_frame(csv_path, columns=['b'])
+    assert isinstance(df, pd.DataFrame) and pgcon.data is df
+    assert list(pgcon.records()) == [{'b': 'x'}, {'b': 'y'}]
+
+
+class _StubCursor:
+    def __init__(self, calls):
+        self.calls = calls
+        self.closed = False
+        self.description = None
+        self.rowcount = 2
+
+    def execute(self, query, params=None):
+        self.calls.append(('execute', query, params))
+        self.description = [('a',)] if query.startswith(('SELECT', 'EXECUTE by_id')) else None
+
+    def executemany(self, query, params):
+        self.calls.append(('executemany', query, type(params).__name__, list(params)))
+
+    def copy_expert(self, sql, file):
+        self.calls.append(('copy_expert', sql, file.read()))
+        if sql.startswith('COPY broken'):
+            raise RuntimeError('COPY failed')
+
+    def fetchall(self):
+        return [{'a': 1}]
+
+    def close(self):
+        self.closed = True
+
+
+class _StubConnection:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def cursor(self, **kwargs):
+        self.calls.append(('cursor', kwargs))
+        return _StubCursor(self.calls)
+
+    def commit(self):
+        self.calls.append(('commit',))
+
+    def rollback(self):
+        self.calls.append(('rollback',))
+
+    def close(self):
+        pass
+
+
+def _stub_psycopg2(calls):
+    """Build stand-in psycopg2 and psycopg2.extras modules that record calls."""
+    psycopg2 = types.ModuleType('psycopg2')
+    psycopg2.__spec__ = importlib.machinery.ModuleSpec('psycopg2', None)
+    psycopg2.connect = lambda **kwargs: _StubConnection(calls)
+    extras = types.ModuleType('psycopg2.extras')
+    extras.RealDictCursor = 'RealDictCursor'
+    extras.execute_values = lambda cursor, query, params, page_size: calls.append(
+        ('execute_values', query, type(params).__name__, list(params), page_size))
+    psycopg2.extras = extras
+    return psycopg2, extras
+
+
+def _with_stub_psycopg2(check):
+    calls = []
+    psycopg2, extras = _stub_psycopg2(calls)
+    saved = {name: sys.modules.get(name) for name in ('psycopg2', 'psycopg2.extras')}
+    saved_available = pg_module.POSTGRES_AVAILABLE
+    sys.modules['psycopg2'], sys.modules['psycopg2.extras'] = psycopg2, extras
+    pg_module.POSTGRES_AVAILABLE = True
+    try:
+        check(Pgcon(), calls)
+    finally:
+        pg_module.POSTGRES_AVAILABLE = saved_available
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+def test_create_table_from_csv():
+    """Rows are bulk loaded with one COPY that names the file's columns."""
+    def check(pgcon, calls):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'rows.csv')
+            with open(csv_path, 'w', encoding='utf-8') as f:
+                f.write('id,score,note\n1,NA,café\n2,2.5,\n')
+
+            # "NA" is data for COPY, so the column must not be typed numeric
+            pgcon.create_table_from_csv(csv_path, 'events')
+            assert ('execute', 'CREATE TABLE IF NOT EXISTS events (id INTEGER, score TEXT, note TEXT)',
+                    None) in calls
+            assert ('copy_expert', 'COPY events (id, score, note) FROM STDIN WITH (FORMAT csv, HEADER true)',
+                    'id,score,note\n1,NA,café\n2,2.5,\n'.encode('utf-8')) in calls
+
+            # A column subset is re-serialized in file order
+            pgcon.create_table_from_csv(csv_path, 'notes', columns=['note', 'id'])
+            assert ('copy_expert', 'COPY notes (id, note) FROM STDIN WITH (FORMAT csv, HEADER true)',
+                    'id,note\n1,café\n2,\n') in calls
+            assert calls.count(('commit',)) == 4
+
+            # A failed COPY is rolled back and re-raised
+            with pytest.raises(RuntimeError):
+                pgcon.create_table_from_csv(csv_path, 'broken')
+            assert calls[-1] == ('rollback',)
+    _with_stub_psycopg2(check)
+
+
+def test_execute_many():
+    """INSERT ... VALUES %s goes through execute_values, anything else through executemany."""
+    def check(pgcon, calls):
+        df = pd.DataFrame({'a': [1, 2], 'b': ['x', None]})
+        pgcon.insert_dataframe(df, 'events')
+        assert ('execute_values', 'INSERT INTO events (a, b) VALUES %s', 'generator',
+                [(1, 'x'), (2, None)], 1000) in calls
+
+        # Rows stream to the driver and are counted as they are consumed
+        rows = ((n,) for n in (3, 4))
+        assert pgcon.execute_many('UPDATE events SET a = %s', rows) == 2
+        assert ('executemany', 'UPDATE events SET a = %s', 'generator', [(3,), (4,)]) in calls
+        assert calls.count(('commit',)) == 2
+    _with_stub_psycopg2(check)
+
+
+def test_prepare_and_run():
+    """Prepared statements run through one shared cursor."""
+    def check(pgcon, calls):
+        pgcon.prepare('by_id', 'SELECT * FROM events WHERE id = $1')
+        assert pgcon.run('by_id', (7,)) == [{'a': 1}]
+        assert ('execute', 'PREPARE by_id AS SELECT * FROM events WHERE id = $1', None) in calls
+        assert ('execute', 'EXECUTE by_id (%s)', (7,)) in calls
+
+        pgcon.prepare('purge', 'DELETE FROM events WHERE id = $1')
+        assert pgcon.run('purge', (7,)) == [{'affected_rows': 2}]
+        assert [call for call in calls if call[0] == 'cursor'] == [('cursor', {'cursor_factory': 'RealDictCursor'})]
+        pgcon.close()
+    _with_stub_psycopg2(check)
+
+
+def test_broken_psycopg2_install():
+    """A psycopg2 that is installed but fails to import is reported like a missing one."""
+    saved = sys.modules.get('psycopg2')
+    saved_available = pg_module.POSTGRES_AVAILABLE
+    # A None entry makes "import psycopg2" raise ImportError
+    sys.modules['psycopg2'] = None
+    pg_module.POSTGRES_AVAILABLE = True
+    try:
+        pgcon = Pgcon()
+        for call in (pgcon.connect, pgcon._get_cursor):
+            with pytest.raises(ImportError) as excinfo:
+                call()
+            assert str(excinfo.value) == pg_module._POSTGRES_UNAVAILABLE_MESSAGE
+    finally:
+        pg_module.POSTGRES_AVAILABLE = saved_available
+        if saved is None:
+            sys.modules.pop('psycopg2', None)
+        else:
+            sys.modules['psycopg2'] = saved
+
+
 def main():
     print("Testing Pgcon Module Import and Functionality")
     print("=" * 50)
@@ -78,6 +258,12 @@ def main():
     
     print("\nTesting CSV Functionality:")
     test_csv_functionality()
+
+    print("\nTesting Row and Batch APIs:")
+    for test in (test_records, test_create_table_from_csv, test_execute_many,
+                 test_prepare_and_run, test_broken_psycopg2_install):
+        test()
+        print(f"[SUCCESS] {test.__name__}")
     
     print("\n" + "=" * 50)
     print("Module import and basic functionality verified!")